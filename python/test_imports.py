@@ -45,6 +45,12 @@ def test_imports():
     )
     print("✓ All package imports")
     
+    # Every exported name must resolve through the lazy loader
+    import python.vllm_test_infra as infra
+    for name in infra.__all__:
+        getattr(infra, name)
+    print("✓ All __all__ exports resolve")
+    
     # Test basic functionality
     note("Test message")
     print("✓ Basic functionality")
@@ -52,6 +58,97 @@ def test_imports():
     print("\n✅ All imports successful!")
     return 0
 
+def test_run_tracks_same_named_process():
+    """Test run() registers under name:pid when name is already taken."""
+    import atexit
+    import tempfile
+    import threading
+    import time
+    
+    from python.vllm_test_infra import LogManager, ProcessManager
+    
+    from python.vllm_test_infra import process
+    
+    log_manager = LogManager(tempfile.mkdtemp())
+    log_manager.setup()
+    process_manager = ProcessManager(log_manager)
+    # Skip the exit-time zombie sweep, it pkills "python.*test"
+    atexit.unregister(process._cleanup_live_managers)
+    
+    server = process_manager.run_background("vllm_server", ["sleep", "30"])
+    client = threading.Thread(
+        target=process_manager.run,
+        args=("vllm_server", ["sleep", "30"]),
+        kwargs={"log_file": "client"},
+    )
+    client.start()
+    
+    deadline = time.time() + 5
+    while len(process_manager.processes) < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    keys = sorted(process_manager.processes)
+    assert len(keys) == 2 and keys[0] == "vllm_server", keys
+    assert keys[1].startswith("vllm_server:"), keys
+    assert process_manager.processes["vllm_server"] is server
+    
+    process_manager.terminate_all()
+    client.join(timeout=10)
+    assert not client.is_alive()
+    assert server.poll() is not None
+    assert not process_manager.processes
+    print("✓ run() fallback key reached by terminate_all")
+    return 0
+
+
+def test_base_server_args_tp():
+    """Test -tp is only skipped when a real TP flag is already present."""
+    from types import SimpleNamespace
+    
+    from python.vllm_test_infra import BaseBenchmarkRunner, extract_tp_dp_from_args
+    
+    def build(server_args_base):
+        runner = object.__new__(BaseBenchmarkRunner)
+        runner.args = SimpleNamespace(server_args_base=server_args_base, tensor_parallel_size=4)
+        return runner._build_base_server_args()
+    
+    args = build("--step-tp-foo 1")
+    assert args[:4] == ["--step-tp-foo", "1", "-tp", "4"], args
+    
+    args = build("--tensor-parallel-size=2")
+    assert "-tp" not in args, args
+    assert extract_tp_dp_from_args(" ".join(args)) == (2, None)
+    
+    assert extract_tp_dp_from_args("--step-tp 3 -dp=2") == (None, 2)
+    print("✓ _build_base_server_args TP detection")
+    return 0
+
+
+def test_server_argv_passthrough():
+    """Test an argv list reaches the server command without re-splitting."""
+    from python.vllm_test_infra import VLLMServer
+    
+    server = object.__new__(VLLMServer)
+    server.model = "m"
+    server.host = "localhost"
+    server.port = 8000
+    server.venv_path = None
+    
+    argv = ["--served-model-name", "name with -tp 8", "--max-model-len", "1024"]
+    command, _ = server._build_command(argv)
+    assert command[-4:] == argv, command
+    
+    # "-tp 8" inside a value is not a TP flag
+    from python.vllm_test_infra import extract_tp_dp_from_args
+    assert extract_tp_dp_from_args(argv) == (None, None)
+    print("✓ VLLMServer argv passthrough")
+    return 0
+
+
 if __name__ == "__main__":
-    sys.exit(test_imports())
+    sys.exit(
+        test_imports()
+        or test_run_tracks_same_named_process()
+        or test_base_server_args_tp()
+        or test_server_argv_passthrough()
+    )
 
@@ -2,63 +2,70 @@
 
 A reusable infrastructure for running vLLM tests with robust server management,
 process monitoring, logging, and user interfaces.
+
+Public names are resolved lazily (PEP 562) so that short-lived entry points
+only pay for the submodules they actually touch.
 """
 
-from .benchmark_runner import BaseBenchmarkRunner
-from .config import Config
-from .eval_runner import EvalRunner
-from .git import GitError, GitManager
-from .logging import LogManager
-from .process import ProcessManager
-from .server import VLLMServer, VLLMServerError
-from .signal_handler import register_cleanup, setup_signal_handlers
-from .ui import UIManager, run_with_ui
-from .utils import (
-    check_gpu_memory,
-    cleanup_zombie_processes,
-    compute_gpu_count,
-    extract_tp_dp_from_args,
-    is_chg_available,
-    note,
-    parse_variants,
-    split_args_string,
-    timestamp,
-)
+import importlib
 
 __version__ = "0.1.0"
 
-__all__ = [
+# Maps each public name to the submodule that defines it
+_LAZY = {
     # Benchmark
-    "BaseBenchmarkRunner",
+    "BaseBenchmarkRunner": ".benchmark_runner",
     # Config
-    "Config",
+    "Config": ".config",
     # Evaluation
-    "EvalRunner",
+    "EvalRunner": ".eval_runner",
     # Git
-    "GitManager",
-    "GitError",
+    "GitManager": ".git",
+    "GitError": ".git",
+    "GitSnapshot": ".git",
     # Logging
-    "LogManager",
+    "LogManager": ".logging",
     # Process
-    "ProcessManager",
+    "ProcessManager": ".process",
     # Server
-    "VLLMServer",
-    "VLLMServerError",
+    "VLLMServer": ".server",
+    "VLLMServerError": ".server",
     # Signal Handling
-    "register_cleanup",
-    "setup_signal_handlers",
+    "register_cleanup": ".signal_handler",
+    "setup_signal_handlers": ".signal_handler",
     # UI
-    "UIManager",
-    "run_with_ui",
+    "UIManager": ".ui",
+    "run_with_ui": ".ui",
     # Utils
-    "check_gpu_memory",
-    "cleanup_zombie_processes",
-    "compute_gpu_count",
-    "extract_tp_dp_from_args",
-    "is_chg_available",
-    "note",
-    "parse_variants",
-    "split_args_string",
-    "timestamp",
-]
+    "check_gpu_memory": ".utils",
+    "cleanup_zombie_processes": ".utils",
+    "compute_gpu_count": ".utils",
+    "extract_tp_dp_from_args": ".utils",
+    "GpuMem": ".utils",
+    "is_chg_available": ".utils",
+    "note": ".utils",
+    "parse_env_csv": ".utils",
+    "parse_variants": ".utils",
+    "split_args_string": ".utils",
+    "timestamp": ".utils",
+}
+
+# Export list is derived from the lazy map so the two cannot drift
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    """Import the submodule defining `name` on first access."""
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so __getattr__ is bypassed next time
+    return value
+
 
+def __dir__():
+    """Include lazily-loaded names in dir()."""
+    return sorted(set(globals()) | set(__all__))
@@ -1,26 +1,53 @@
 """Shared benchmark runner utilities for vLLM benchmarks."""
 
+import os
+import queue
 import re
+import shlex
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from .config import Config
 from .git import GitManager
 from .logging import LogManager
 from .process import ProcessManager
 from .server import VLLMServer
-from .utils import parse_variants, split_args_string
+from .utils import (
+    check_gpu_memory,
+    compute_gpu_count,
+    extract_tp_dp_from_args,
+    is_chg_available,
+    parse_env_csv,
+    parse_variants,
+    split_args_string,
+)
 
 
 class BaseBenchmarkRunner:
     """Base class for benchmark runners with shared functionality."""
     
     # Always-on server args
-    ALWAYS_SERVER_ARGS = [
+    ALWAYS_SERVER_ARGS = (
         "--no-enable-prefix-caching",
         "--disable-log-stats",
         "--trust-remote-code",
-    ]
+    )
+    
+    # Args that not every script defines, with the default used when absent
+    OPTIONAL_ARGS = {
+        "terse_name": None,
+        "label_suffix": "",
+        "tensor_parallel_size": 1,
+        "resume": False,
+        "parallel_variants": 1,
+    }
+    
+    # Flags that set tensor parallelism on `vllm serve`
+    _TP_FLAGS = frozenset({"-tp", "--tensor-parallel-size"})
+    
+    # Characters not allowed in the dataset part of result filenames
+    _DS_SANITIZE = re.compile(r'[^A-Za-z0-9._-]+')
     
     def __init__(self, args):
         """Initialize BaseBenchmarkRunner.
@@ -28,6 +55,10 @@ class BaseBenchmarkRunner:
         Args:
             args: Parsed command line arguments.
         """
+        # Fill in optional args once so later code can read them directly
+        for name, default in self.OPTIONAL_ARGS.items():
+            if not hasattr(args, name):
+                setattr(args, name, default)
         self.args = args
         
         # Setup configuration
@@ -35,11 +66,22 @@ class BaseBenchmarkRunner:
         self.config.activate_venv()
         
         # Derive terse model name
-        if hasattr(args, 'terse_name') and args.terse_name:
+        if args.terse_name:
             self.terse_model_name = args.terse_name
         else:
             self.terse_model_name = Path(args.model).name.replace("/", "_")
         
+        # Filename components that are fixed for the whole run
+        self._ds_safe = self._DS_SANITIZE.sub('-', args.dataset)
+        self._filename_suffix = (
+            f"_{args.label_suffix}" if args.label_suffix else ""
+        )
+        
+        # Result filenames keyed by (variant, rate). The filename also depends
+        # on run_seconds/random_in/random_out, so args must not change after
+        # __init__.
+        self._filename_cache: Dict[Tuple[str, float], str] = {}
+        
         # Parse rates
         self.rates = [float(r.strip()) for r in args.rates.split(',')]
         
@@ -55,6 +97,21 @@ class BaseBenchmarkRunner:
         
         # Build base server args
         self.server_args_base = self._build_base_server_args()
+        
+        # Benchmark client args that are the same for every rate/variant
+        self._bench_cmd_prefix: Tuple[str, ...] = (
+            os.path.join(args.venv, "bin", "vllm"), "bench", "serve",
+            "--model", args.model,
+            "--host", args.host,
+            "--dataset-name", args.dataset,
+            "--random-input-len", str(args.random_in),
+            "--random-output-len", str(args.random_out),
+            "--random-range-ratio", str(args.random_range_ratio),
+            "--save-result",
+            "--seed", "42",
+            "--ignore-eos",
+            "--trust-remote-code",
+        )
     
     def _setup_directories(self):
         """Setup output directories."""
@@ -64,10 +121,7 @@ class BaseBenchmarkRunner:
         """Setup logging."""
         self.log_manager = LogManager(str(self.log_dir))
         self.log_manager.setup()
-        self.log_manager.init_log_file("server")
-        self.log_manager.init_log_file("bench")
-        self.log_manager.init_log_file("script")
-        self.log_manager.init_log_file("summary_current")
+        self.log_manager.init_log_files(("server", "bench", "script", "summary_current"))
         
         self.logger = self.log_manager.get_logger("benchmark", log_to_file="script")
     
@@ -87,19 +141,20 @@ class BaseBenchmarkRunner:
             # No variants specified, use single "base" variant with default args
             return [("base", default_args, "")]
     
-    def _build_base_server_args(self) -> str:
-        """Build base server arguments."""
+    def _build_base_server_args(self) -> List[str]:
+        """Build base server arguments as an argv list."""
         base_args = split_args_string(self.args.server_args_base)
         
         # Add -tp if specified and not already in args
-        if hasattr(self.args, 'tensor_parallel_size') and self.args.tensor_parallel_size > 1:
-            if not any('-tp' in arg or '--tensor-parallel-size' in arg for arg in base_args):
+        if self.args.tensor_parallel_size > 1:
+            flags = {arg.split('=', 1)[0] for arg in base_args}
+            if not (self._TP_FLAGS & flags):
                 base_args.extend(["-tp", str(self.args.tensor_parallel_size)])
         
         # Add always-on args
         base_args.extend(self.ALWAYS_SERVER_ARGS)
         
-        return ' '.join(base_args)
+        return base_args
     
     def _get_result_filename(self, variant: str, rate: float) -> str:
         """Generate result filename.
@@ -111,16 +166,25 @@ class BaseBenchmarkRunner:
         Returns:
             Result filename.
         """
-        num_prompts = int(rate * self.args.run_seconds)
-        ds_safe = re.sub(r'[^A-Za-z0-9._-]+', '-', self.args.dataset)
-        
-        suffix = f"_{self.args.label_suffix}" if hasattr(self.args, 'label_suffix') and self.args.label_suffix else ""
-        
-        return (
-            f"bench_model-{self.terse_model_name}_rate-{rate}_v-{variant}_"
-            f"np-{num_prompts}_in-{self.args.random_in}_out-{self.args.random_out}_"
-            f"ds-{ds_safe}{suffix}.json"
-        )
+        key = (variant, rate)
+        filename = self._filename_cache.get(key)
+        if filename is None:
+            num_prompts = int(rate * self.args.run_seconds)
+            filename = (
+                f"bench_model-{self.terse_model_name}_rate-{rate}_v-{variant}_"
+                f"np-{num_prompts}_in-{self.args.random_in}_out-{self.args.random_out}_"
+                f"ds-{self._ds_safe}{self._filename_suffix}.json"
+            )
+            self._filename_cache[key] = filename
+        return filename
+    
+    @staticmethod
+    def _is_nonempty_file(filepath: Path) -> bool:
+        """Check if a file exists and is non-empty with a single stat()."""
+        try:
+            return filepath.stat().st_size > 0
+        except OSError:
+            return False
     
     def _result_exists(self, results_dir: Path, variant: str, rate: float) -> bool:
         """Check if result file exists and is non-empty.
@@ -134,8 +198,36 @@ class BaseBenchmarkRunner:
             True if result exists.
         """
         filename = self._get_result_filename(variant, rate)
-        filepath = results_dir / filename
-        return filepath.exists() and filepath.stat().st_size > 0
+        return self._is_nonempty_file(results_dir / filename)
+    
+    def _plan_rates(self, results_dir: Path, variant: str) -> List[Tuple[float, Path, bool]]:
+        """Resolve result paths and existence for every rate of a variant.
+        
+        Args:
+            results_dir: Results directory.
+            variant: Variant label.
+        
+        Returns:
+            List of (rate, result_path, exists) tuples in rate order.
+        """
+        needed = {self._get_result_filename(variant, rate) for rate in self.rates}
+        
+        # One directory listing instead of a stat() per rate; only the
+        # matching entries are stat'ed for their size
+        existing = set()
+        try:
+            with os.scandir(results_dir) as entries:
+                for entry in entries:
+                    if entry.name in needed and entry.is_file() and entry.stat().st_size > 0:
+                        existing.add(entry.name)
+        except OSError:
+            pass
+        
+        plan = []
+        for rate in self.rates:
+            filename = self._get_result_filename(variant, rate)
+            plan.append((rate, results_dir / filename, filename in existing))
+        return plan
     
     def run_client_for_rate(
         self,
@@ -143,7 +235,11 @@ class BaseBenchmarkRunner:
         branch_label: str,
         variant: str,
         rate: float,
-        force_rerun: bool = False
+        force_rerun: bool = False,
+        result_path: Optional[Path] = None,
+        result_exists: Optional[bool] = None,
+        port: Optional[int] = None,
+        log_file: str = "bench"
     ) -> bool:
         """Run benchmark client for a specific rate.
         
@@ -153,54 +249,52 @@ class BaseBenchmarkRunner:
             variant: Variant label.
             rate: Request rate.
             force_rerun: Force rerun even if result exists.
+            result_path: Precomputed result file path (from _plan_rates).
+            result_exists: Precomputed existence of the result file
+                (checked on disk if None).
+            port: Server port to target (defaults to --port).
+            log_file: Log file name for client output.
         
         Returns:
             True if successful.
         """
-        import os
-        
+        if port is None:
+            port = self.args.port
         num_prompts = int(rate * self.args.run_seconds)
-        filename = self._get_result_filename(variant, rate)
-        filepath = results_dir / filename
+        if result_path is None:
+            result_path = results_dir / self._get_result_filename(variant, rate)
+        filename = result_path.name
         
         # Check if we should skip
-        if self._result_exists(results_dir, variant, rate) and not force_rerun:
+        if result_exists is None:
+            result_exists = self._is_nonempty_file(result_path)
+        if result_exists and not force_rerun:
             self.logger.info(f"Reusing existing result for {branch_label}/{variant} rate={rate}")
             return True
         
-        # Build vllm bench command
-        vllm_cmd = os.path.join(self.args.venv, "bin", "vllm")
-        
+        # Build vllm bench command from the per-run invariant prefix
         command = [
-            vllm_cmd, "bench", "serve",
-            "--model", self.args.model,
-            "--host", self.args.host,
-            "--port", str(self.args.port),
-            "--dataset-name", self.args.dataset,
-            "--random-input-len", str(self.args.random_in),
-            "--random-output-len", str(self.args.random_out),
-            "--random-range-ratio", str(self.args.random_range_ratio),
+            *self._bench_cmd_prefix,
+            "--port", str(port),
             "--num-prompts", str(num_prompts),
             "--request-rate", str(rate),
-            "--save-result",
             "--result-dir", str(results_dir),
             "--result-filename", filename,
-            "--seed", "42",
-            "--ignore-eos",
-            "--trust-remote-code",
         ]
         
         self.logger.info(f"Running client: {branch_label}/{variant} rate={rate} prompts={num_prompts}")
-        self.logger.info("=" * 60)
-        self.logger.info(f"Benchmark Command (for manual reproduction):")
-        self.logger.info(f"  {' '.join(command)}")
-        self.logger.info("=" * 60)
+        self.logger.info("\n".join([
+            "=" * 60,
+            "Benchmark Command (for manual reproduction):",
+            f"  {' '.join(command)}",
+            "=" * 60,
+        ]))
         
         try:
             result = self.process_manager.run(
                 name=f"bench_{branch_label}_{variant}_{rate}",
                 command=command,
-                log_file="bench",
+                log_file=log_file,
                 timeout=self.args.run_seconds * 3  # 3x safety margin
             )
             
@@ -222,7 +316,10 @@ class BaseBenchmarkRunner:
         variant_label: str,
         variant_args: str,
         variant_env: str,
-        force_rerun: bool = False
+        force_rerun: bool = False,
+        port: Optional[int] = None,
+        gpu_ids: Optional[List[str]] = None,
+        log_suffix: str = ""
     ) -> None:
         """Run benchmarks for a single variant.
         
@@ -233,55 +330,76 @@ class BaseBenchmarkRunner:
             variant_args: Variant-specific server args.
             variant_env: Variant-specific environment variables.
             force_rerun: Force rerun even if results exist.
+            port: Server port (defaults to --port).
+            gpu_ids: GPUs to pin the server to via CUDA_VISIBLE_DEVICES
+                (unless the variant env sets it).
+            log_suffix: Suffix for the server/bench log names, so concurrent
+                variants write to separate logs.
         """
+        if port is None:
+            port = self.args.port
         self.logger.info(f"Starting variant: {branch_label}/{variant_label}")
         
+        # Resolve result files once; reused by the resume check and each client run
+        rate_plan = self._plan_rates(results_dir, variant_label)
+        
         # Check if all results already exist and we're not forcing rerun
-        if not force_rerun and hasattr(self.args, 'resume') and self.args.resume:
-            all_exist = all(
-                self._result_exists(results_dir, variant_label, rate)
-                for rate in self.rates
-            )
+        if not force_rerun and self.args.resume:
+            all_exist = all(exists for _, _, exists in rate_plan)
             
             if all_exist:
                 self.logger.info(f"Skipping {branch_label}/{variant_label} (all results present)")
                 return
         
-        # Build full server args
-        full_args = f"{self.server_args_base} {variant_args}".strip()
+        # Build full server args and env (env parsed once, reused for logging)
+        full_args = self.server_args_base + split_args_string(variant_args)
+        env_dict = parse_env_csv(variant_env) if variant_env else {}
+        if gpu_ids:
+            env_dict.setdefault("CUDA_VISIBLE_DEVICES", ",".join(gpu_ids))
         
         # Start server
         server = VLLMServer(
             model=self.args.model,
             host=self.args.host,
-            port=self.args.port,
+            port=port,
             venv_path=self.args.venv,
             log_manager=self.log_manager,
-            process_manager=self.process_manager
+            process_manager=self.process_manager,
+            process_name=f"vllm_server{log_suffix}"
         )
         
         with server:
             self.logger.info(f"Starting server for {branch_label}/{variant_label}")
             
             # Log the exact server command for reproducibility
-            server_cmd = f"vllm serve {self.args.model} --host {self.args.host} --port {self.args.port} {full_args}"
-            if variant_env:
-                env_vars = " ".join([f"{k}={v}" for k, v in [pair.split("=", 1) for pair in variant_env.split(",") if pair]])
+            server_cmd = shlex.join([
+                "vllm", "serve", self.args.model,
+                "--host", self.args.host, "--port", str(port),
+                *full_args,
+            ])
+            if env_dict:
+                env_vars = " ".join(f"{k}={shlex.quote(v)}" for k, v in env_dict.items())
                 server_cmd = f"{env_vars} {server_cmd}"
-            self.logger.info("=" * 60)
-            self.logger.info(f"Server Command (for manual reproduction):")
-            self.logger.info(f"  {server_cmd}")
-            self.logger.info("=" * 60)
+            self.logger.info("\n".join([
+                "=" * 60,
+                "Server Command (for manual reproduction):",
+                f"  {server_cmd}",
+                "=" * 60,
+            ]))
             
-            server.start(args=full_args, env_csv=variant_env, log_file="server")
+            server.start(args=full_args, env_csv=env_dict, log_file=f"server{log_suffix}")
             
             if not server.wait_for_ready(timeout=600):
                 self.logger.error(f"Server failed to start for {branch_label}/{variant_label}")
                 return
             
             # Run benchmarks for each rate
-            for rate in self.rates:
-                self.run_client_for_rate(results_dir, branch_label, variant_label, rate, force_rerun)
+            for rate, result_path, exists in rate_plan:
+                self.run_client_for_rate(
+                    results_dir, branch_label, variant_label, rate, force_rerun,
+                    result_path=result_path, result_exists=exists,
+                    port=port, log_file=f"bench{log_suffix}"
+                )
         
         self.logger.info(f"Completed variant: {branch_label}/{variant_label}")
     
@@ -310,18 +428,121 @@ class BaseBenchmarkRunner:
         self.logger.info(f"Running {branch_label} branch: {ref}")
         self.logger.info(f"=" * 60)
         
-        # Checkout branch
-        self.git_manager.checkout(ref)
+        # Checkout branch (skipped when HEAD is already there)
+        if self.git_manager.is_checked_out(ref):
+            self.logger.info(f"Already at '{ref}', skipping checkout")
+        else:
+            self.git_manager.checkout(ref)
         
         # Pull if requested
         if pull:
             self.git_manager.pull(ref)
         
-        # Build if requested
+        # Build if requested (skipped when this clean commit was already built)
         if build:
-            self.git_manager.build()
+            if self.git_manager.is_build_current():
+                self.logger.info(f"Build for '{ref}' is up to date, skipping build")
+            else:
+                self.git_manager.build(log_path=str(self.log_manager.get_log_path("build")))
+        
+        # Run each variant, concurrently on disjoint GPUs if requested
+        gpu_slots = self._gpu_slots(variants)
+        if len(gpu_slots) > 1:
+            self._run_variants_parallel(results_dir, branch_label, variants, gpu_slots, force_rerun)
+            return
         
-        # Run each variant
         for variant_label, variant_args, variant_env in variants:
             self.run_variant(results_dir, branch_label, variant_label, variant_args, variant_env, force_rerun)
+    
+    def _gpu_slots(self, variants: List[Tuple[str, str, str]]) -> List[List[str]]:
+        """Partition visible GPUs into disjoint slots for parallel variants.
+        
+        Args:
+            variants: List of (label, args, env) tuples.
+        
+        Returns:
+            List of GPU id lists, one per slot. Fewer than two slots means
+            variants should run sequentially.
+        """
+        max_parallel = min(self.args.parallel_variants or 1, len(variants))
+        if max_parallel < 2:
+            return []
+        
+        # Every slot must fit the largest variant
+        gpus_per_variant = max(
+            compute_gpu_count(*extract_tp_dp_from_args(
+                self.server_args_base + split_args_string(variant_args)
+            ))
+            for _, variant_args, _ in variants
+        )
+        
+        visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+        if visible:
+            gpus = [g.strip() for g in visible.split(",") if g.strip()]
+        else:
+            gpus = [str(gpu.index) for gpu in check_gpu_memory()]
+        
+        num_slots = min(max_parallel, len(gpus) // gpus_per_variant)
+        if num_slots < 2:
+            self.logger.info(
+                f"Not enough GPUs for parallel variants ({len(gpus)} visible, "
+                f"{gpus_per_variant} per variant), running sequentially"
+            )
+            return []
+        
+        return [
+            gpus[i * gpus_per_variant:(i + 1) * gpus_per_variant]
+            for i in range(num_slots)
+        ]
+    
+    def _run_variants_parallel(
+        self,
+        results_dir: Path,
+        branch_label: str,
+        variants: List[Tuple[str, str, str]],
+        gpu_slots: List[List[str]],
+        force_rerun: bool
+    ) -> None:
+        """Run variants concurrently, one server per GPU slot.
+        
+        Slot i serves on --port + i and logs to server_slot<i>/bench_slot<i>
+        (slot 0 keeps the plain server/bench logs). When chg is available it
+        reserves GPUs itself, so CUDA_VISIBLE_DEVICES is not pinned.
+        
+        Args:
+            results_dir: Results directory.
+            branch_label: Branch label for logging.
+            variants: List of (label, args, env) tuples.
+            gpu_slots: Disjoint GPU id lists from _gpu_slots.
+            force_rerun: Force rerun even if results exist.
+        """
+        pin_gpus = not is_chg_available()
+        suffixes = [""] + [f"_slot{i}" for i in range(1, len(gpu_slots))]
+        self.log_manager.init_log_files(
+            f"{name}{suffix}" for suffix in suffixes[1:] for name in ("server", "bench")
+        )
+        self.logger.info(f"Running {len(variants)} variants across {len(gpu_slots)} GPU slots")
+        
+        free_slots: "queue.Queue[int]" = queue.Queue()
+        for slot in range(len(gpu_slots)):
+            free_slots.put(slot)
+        
+        def run_on_free_slot(variant: Tuple[str, str, str]) -> None:
+            variant_label, variant_args, variant_env = variant
+            slot = free_slots.get()
+            try:
+                self.run_variant(
+                    results_dir, branch_label, variant_label, variant_args, variant_env,
+                    force_rerun,
+                    port=self.args.port + slot,
+                    gpu_ids=gpu_slots[slot] if pin_gpus else None,
+                    log_suffix=suffixes[slot]
+                )
+            finally:
+                free_slots.put(slot)
+        
+        with ThreadPoolExecutor(max_workers=len(gpu_slots)) as executor:
+            futures = [executor.submit(run_on_free_slot, variant) for variant in variants]
+            for future in futures:
+                future.result()
 
@@ -2,12 +2,15 @@
 
 import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set, Tuple
 
 
 class Config:
     """Manages configuration and environment variables."""
     
+    # Absolute venv paths already activated in this process
+    _ACTIVATED: Set[str] = set()
+    
     def __init__(self, venv_path: Optional[str] = None):
         """Initialize Config.
         
@@ -16,6 +19,8 @@ class Config:
         """
         self.venv_path = Path(venv_path) if venv_path else None
         self._env_overrides: Dict[str, str] = {}
+        # (len(os.environ), merged env) from the last get_full_env() call
+        self._env_cache: Optional[Tuple[int, Dict[str, str]]] = None
     
     def set_env(self, key: str, value: str) -> None:
         """Set an environment variable override.
@@ -25,6 +30,7 @@ class Config:
             value: Environment variable value.
         """
         self._env_overrides[key] = value
+        self._env_cache = None
     
     def get_env(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get environment variable value.
@@ -41,34 +47,47 @@ class Config:
     def get_full_env(self) -> Dict[str, str]:
         """Get full environment with overrides applied.
         
+        The merged environment is cached and rebuilt after set_env() or
+        activate_venv(), or when variables are added to or removed from
+        os.environ. Changing the value of an existing os.environ entry
+        outside of Config is not detected.
+        
         Returns:
-            Dictionary of environment variables.
+            Dictionary of environment variables (a copy the caller may modify).
         """
-        env = os.environ.copy()
-        env.update(self._env_overrides)
-        return env
+        if self._env_cache is None or self._env_cache[0] != len(os.environ):
+            env = os.environ.copy()
+            env.update(self._env_overrides)
+            self._env_cache = (len(os.environ), env)
+        return dict(self._env_cache[1])
     
     def activate_venv(self) -> None:
-        """Activate virtual environment by updating PATH and env vars."""
+        """Activate virtual environment by updating PATH and env vars.
+        
+        Idempotent: once a venv has been activated in this process, later
+        calls (from any Config) skip the filesystem check and PATH scan.
+        """
         if not self.venv_path:
             return
         
-        if not self.venv_path.exists():
-            raise ValueError(f"Virtual environment not found: {self.venv_path}")
-        
-        # Update PATH to include venv bin directory
-        venv_bin = self.venv_path / "bin"
-        current_path = os.environ.get("PATH", "")
-        
-        # Add venv bin to front of PATH if not already there
-        venv_bin_str = str(venv_bin)
-        if venv_bin_str not in current_path:
-            os.environ["PATH"] = f"{venv_bin_str}:{current_path}"
-            self._env_overrides["PATH"] = os.environ["PATH"]
+        venv_key = os.path.abspath(self.venv_path)
+        if venv_key not in Config._ACTIVATED:
+            if not self.venv_path.exists():
+                raise ValueError(f"Virtual environment not found: {self.venv_path}")
+            
+            # Add venv bin to front of PATH if not already there
+            venv_bin_str = str(self.venv_path / "bin")
+            current_path = os.environ.get("PATH", "")
+            if venv_bin_str not in current_path.split(os.pathsep):
+                os.environ["PATH"] = f"{venv_bin_str}{os.pathsep}{current_path}"
+                self._env_overrides["PATH"] = os.environ["PATH"]
+            
+            # Set VIRTUAL_ENV
+            os.environ["VIRTUAL_ENV"] = str(self.venv_path)
+            Config._ACTIVATED.add(venv_key)
         
-        # Set VIRTUAL_ENV
-        os.environ["VIRTUAL_ENV"] = str(self.venv_path)
         self._env_overrides["VIRTUAL_ENV"] = str(self.venv_path)
+        self._env_cache = None
     
     @staticmethod
     def normalize_path(path: str) -> Path:
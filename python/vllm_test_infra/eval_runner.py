@@ -1,6 +1,6 @@
 """Shared evaluation runner utilities for vLLM evaluations."""
 
-import glob
+import os
 from pathlib import Path
 from typing import List, Optional
 
@@ -70,10 +70,12 @@ class EvalRunner:
             server_cmd = f"vllm serve {self.model} --host {self.host} --port {self.port}"
             if server_args:
                 server_cmd += f" {server_args}"
-            self.logger.info("=" * 60)
-            self.logger.info("Server Command (for manual reproduction):")
-            self.logger.info(f"  {server_cmd}")
-            self.logger.info("=" * 60)
+            self.logger.info("\n".join([
+                "=" * 60,
+                "Server Command (for manual reproduction):",
+                f"  {server_cmd}",
+                "=" * 60,
+            ]))
             
             # Create and start server
             self.logger.info("Starting vLLM server...")
@@ -116,11 +118,13 @@ class EvalRunner:
                     batch_size=batch_size
                 )
                 
-                self.logger.info("=" * 60)
-                self.logger.info("Evaluation Command (for manual reproduction):")
-                self.logger.info(f"  {' '.join(eval_cmd)}")
-                self.logger.info("=" * 60)
-                self.logger.info("")
+                self.logger.info("\n".join([
+                    "=" * 60,
+                    "Evaluation Command (for manual reproduction):",
+                    f"  {' '.join(eval_cmd)}",
+                    "=" * 60,
+                    "",
+                ]))
                 
                 # Run evaluation
                 try:
@@ -197,17 +201,39 @@ class EvalRunner:
     def find_results(self) -> Optional[Path]:
         """Find most recent results file.
         
+        Looks for ``<out_base>/*/results_*.json`` first and falls back to the
+        legacy ``<out_base>/results_*/results.json`` layout. Both layouts are
+        collected in a single scandir pass; within a layout the
+        lexicographically greatest path wins (lm_eval embeds a timestamp in
+        the name).
+        
         Returns:
             Path to results file, or None if not found.
         """
-        # Try finding results files in subdirectories first
-        result_files = sorted(glob.glob(str(self.out_base / "*" / "results_*.json")), reverse=True)
+        best = None
+        best_legacy = None
         
-        # Also try legacy format
-        result_files.extend(sorted(glob.glob(str(self.out_base / "results_*" / "results.json")), reverse=True))
+        try:
+            top_entries = list(os.scandir(self.out_base))
+        except OSError:
+            return None
         
-        if result_files:
-            return Path(result_files[0])
+        for top in top_entries:
+            if not top.is_dir():
+                continue
+            is_legacy_dir = top.name.startswith("results_")
+            try:
+                with os.scandir(top.path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name.startswith("results_") and name.endswith(".json"):
+                            if best is None or entry.path > best:
+                                best = entry.path
+                        elif is_legacy_dir and name == "results.json":
+                            if best_legacy is None or entry.path > best_legacy:
+                                best_legacy = entry.path
+            except OSError:
+                continue
         
-        return None
-
+        result = best or best_legacy
+        return Path(result) if result else None
@@ -3,20 +3,121 @@
 import os
 import re
 import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from .logging import read_tail_lines
 from .utils import note
 
+# Refs that look like a commit hash (7-40 lowercase hex characters)
+_COMMIT_HASH_RE = re.compile(r'[0-9a-f]{7,40}')
+
 
 class GitError(Exception):
     """Exception raised for git operation errors."""
     pass
 
 
+@dataclass(frozen=True)
+class GitSnapshot:
+    """Branch, commit and working-tree state read from one `git status` call."""
+    
+    branch: str
+    """Current branch name, or 'HEAD' if detached."""
+    commit: Optional[str]
+    """Full commit hash of HEAD, or None on an unborn branch."""
+    dirty: bool
+    """True if there are uncommitted changes (including untracked files)."""
+
+
+class _CatFileClient:
+    """Long-running `git cat-file --batch-check` process for resolving revisions.
+    
+    Resolving a revision through the pipe costs one write and one line read
+    instead of a fresh `git` fork+exec and repository open.
+    """
+    
+    def __init__(self, repo_dir: Path):
+        self.repo_dir = repo_dir
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+    
+    def _ensure_started(self) -> subprocess.Popen:
+        """Start the cat-file process if it is not running."""
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "-C", str(self.repo_dir), "cat-file",
+                 "--batch-check=%(objectname) %(objecttype)"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+    
+    def resolve(self, rev: str) -> Optional[str]:
+        """Resolve a revision to a full object name.
+        
+        Args:
+            rev: Any revision expression git understands (e.g. 'HEAD',
+                'refs/heads/main', 'v1.0^{commit}').
+        
+        Returns:
+            Full object name, or None if the revision does not resolve.
+        
+        Raises:
+            GitError: If the cat-file process dies.
+        """
+        if not rev or "\n" in rev:
+            return None
+        
+        with self._lock:
+            process = self._ensure_started()
+            try:
+                process.stdin.write(rev.encode() + b"\n")
+                process.stdin.flush()
+                line = process.stdout.readline().decode().split()
+            except (BrokenPipeError, ValueError) as e:
+                raise GitError(f"git cat-file exited unexpectedly: {e}") from e
+        
+        if not line:
+            raise GitError("git cat-file exited unexpectedly")
+        # Unresolvable revisions answer "<rev> missing" / "<rev> ambiguous"
+        if line[-1] in ("missing", "ambiguous"):
+            return None
+        return line[0]
+    
+    def close(self) -> None:
+        """Stop the cat-file process."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            process.stdout.close()
+
+
 class GitManager:
     """Manages git operations for vLLM testing."""
     
+    # Marker (under the git dir) recording the commit of the last successful build
+    BUILD_MARKER = "vllm_test_infra_build_commit"
+    
+    # Lines of build output included in the error when a build fails
+    BUILD_ERROR_LINES = 200
+    
+    # How long an is_dirty() answer is reused; the working tree can change underfoot
+    DIRTY_TTL = 1.0
+    
     def __init__(self, repo_dir: str, venv_path: Optional[str] = None):
         """Initialize GitManager.
         
@@ -29,6 +130,30 @@ class GitManager:
         
         if not (self.repo_dir / ".git").exists():
             raise GitError(f"Not a git repository: {self.repo_dir}")
+        
+        self._cat_file = _CatFileClient(self.repo_dir)
+        # Memoized query results, cleared by checkout/pull/build
+        self._cache: Dict[str, Any] = {}
+    
+    def close(self) -> None:
+        """Stop the persistent git helper process."""
+        self._cat_file.close()
+    
+    def __del__(self):
+        cat_file = getattr(self, "_cat_file", None)
+        if cat_file is not None:
+            cat_file.close()
+    
+    def resolve(self, rev: str) -> Optional[str]:
+        """Resolve a revision to a full object name without spawning git.
+        
+        Args:
+            rev: Git revision expression.
+        
+        Returns:
+            Full object name, or None if the revision does not resolve.
+        """
+        return self._cat_file.resolve(rev)
     
     def _run_git(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
         """Run a git command in the repo directory.
@@ -71,12 +196,55 @@ class GitManager:
             GitError: If checkout fails.
         """
         note(f"Checking out '{ref}'...")
+        self._cache.clear()
         self._run_git("checkout", ref)
         
-        # Show current commit for verification
-        result = self._run_git("rev-parse", "--short", "HEAD")
-        commit_hash = result.stdout.strip()
-        note(f"Now at commit {commit_hash}")
+        # Show current commit for verification (over the cat-file pipe, no extra spawn)
+        note(f"Now at commit {self.resolve('HEAD')}")
+    
+    def is_checked_out(self, ref: str) -> bool:
+        """Check if HEAD already points at a ref.
+        
+        A local branch only counts if it is the current branch (so a later
+        pull still works); any other ref counts if it resolves to the
+        current commit.
+        
+        Args:
+            ref: Git reference (branch, tag, or commit hash).
+        
+        Returns:
+            True if checking out `ref` would not move HEAD.
+        """
+        if self.get_current_branch() == ref:
+            return True
+        
+        if self.resolve(f"refs/heads/{ref}") is not None:
+            return False
+        
+        resolved = self.resolve(f"{ref}^{{commit}}")
+        return resolved is not None and resolved == self.resolve("HEAD")
+    
+    def _build_marker_path(self) -> Path:
+        """Get path of the last-build marker inside the git dir."""
+        result = self._run_git("rev-parse", "--git-path", self.BUILD_MARKER)
+        return self.repo_dir / result.stdout.strip()
+    
+    def is_build_current(self) -> bool:
+        """Check if the last successful build was of the current, clean HEAD.
+        
+        Returns:
+            True if a rebuild would not change anything.
+        """
+        if self.is_dirty():
+            return False
+        
+        try:
+            built_commit = self._build_marker_path().read_text().strip()
+        except OSError:
+            return False
+        
+        head = self.resolve("HEAD")
+        return head is not None and built_commit == head
     
     def pull(self, ref: str, rebase: bool = True) -> bool:
         """Pull latest changes for a branch.
@@ -91,11 +259,12 @@ class GitManager:
             True if pull was performed, False if skipped.
         """
         # Check if ref looks like a commit hash (7-40 hex characters)
-        if re.match(r'^[0-9a-f]{7,40}$', ref):
+        if _COMMIT_HASH_RE.fullmatch(ref):
             note(f"Ref '{ref}' looks like a commit hash, skipping pull")
             return False
         
         note(f"Pulling latest changes for '{ref}'...")
+        self._cache.clear()
         try:
             if rebase:
                 self._run_git("pull", "--rebase")
@@ -106,16 +275,22 @@ class GitManager:
             note(f"Warning: Pull failed: {e}")
             return False
     
-    def build(self, build_type: str = "build_ext") -> None:
+    def build(self, build_type: str = "build_ext", log_path: Optional[str] = None) -> None:
         """Build vLLM extensions.
         
+        Build output is written straight to a file instead of being piped
+        through Python; only its tail is read back if the build fails.
+        
         Args:
             build_type: Build command type (e.g., 'build_ext').
+            log_path: Optional file for the build output (a temporary file
+                is used if omitted).
         
         Raises:
             GitError: If build fails.
         """
         note(f"Building vLLM with: python setup.py {build_type} --inplace")
+        self._cache.clear()
         
         # Get python from venv if available
         if self.venv_path:
@@ -125,46 +300,88 @@ class GitManager:
         
         # Run build in repo directory
         cmd = [python_cmd, "setup.py", build_type, "--inplace"]
-        result = subprocess.run(
-            cmd,
-            cwd=self.repo_dir,
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0:
-            raise GitError(
-                f"Build failed:\n"
-                f"Command: {' '.join(cmd)}\n"
-                f"Error: {result.stderr}"
+        with (open(log_path, 'w+b') if log_path else tempfile.TemporaryFile()) as log:
+            result = subprocess.run(
+                cmd,
+                cwd=self.repo_dir,
+                stdout=log,
+                stderr=subprocess.STDOUT
             )
+            
+            if result.returncode != 0:
+                output_tail = read_tail_lines(log, log.seek(0, os.SEEK_END), self.BUILD_ERROR_LINES)
+                raise GitError(
+                    f"Build failed:\n"
+                    f"Command: {' '.join(cmd)}\n"
+                    f"Last {self.BUILD_ERROR_LINES} lines of output:\n{output_tail}"
+                )
         
         note("Build completed successfully")
+        
+        # Record what was built so an unchanged tree can skip the next build
+        head = self.resolve("HEAD")
+        if head:
+            try:
+                self._build_marker_path().write_text(head + "\n")
+            except OSError:
+                pass
+    
+    def snapshot(self) -> GitSnapshot:
+        """Read branch, commit and dirty state with a single git process.
+        
+        Refreshes the cached branch and dirty state used by the getters below.
+        
+        Returns:
+            GitSnapshot of the repository.
+        """
+        result = self._run_git("status", "--branch", "--porcelain=v2")
+        branch, commit, dirty = "HEAD", None, False
+        for line in result.stdout.splitlines():
+            if line.startswith("# branch.head "):
+                head = line[len("# branch.head "):]
+                branch = "HEAD" if head == "(detached)" else head
+            elif line.startswith("# branch.oid "):
+                oid = line[len("# branch.oid "):]
+                commit = None if oid == "(initial)" else oid
+            elif line and not line.startswith("#"):
+                dirty = True
+        
+        self._cache["branch"] = branch
+        self._cache["dirty"] = (dirty, time.monotonic())
+        return GitSnapshot(branch=branch, commit=commit, dirty=dirty)
     
     def get_current_branch(self) -> str:
-        """Get name of current branch.
+        """Get name of current branch (cached until the next checkout/pull/build).
         
         Returns:
             Current branch name or 'HEAD' if detached.
         """
-        result = self._run_git("rev-parse", "--abbrev-ref", "HEAD")
-        return result.stdout.strip()
+        if "branch" not in self._cache:
+            return self.snapshot().branch
+        return self._cache["branch"]
     
     def get_current_commit(self) -> str:
-        """Get current commit hash.
+        """Get current commit hash (cached until the next checkout/pull/build).
         
         Returns:
             Short commit hash.
         """
-        result = self._run_git("rev-parse", "--short", "HEAD")
-        return result.stdout.strip()
+        if "commit" not in self._cache:
+            result = self._run_git("rev-parse", "--short", "HEAD")
+            self._cache["commit"] = result.stdout.strip()
+        return self._cache["commit"]
     
     def is_dirty(self) -> bool:
         """Check if working directory has uncommitted changes.
         
+        The answer is reused for DIRTY_TTL seconds.
+        
         Returns:
             True if there are uncommitted changes.
         """
-        result = self._run_git("status", "--porcelain")
-        return bool(result.stdout.strip())
+        cached = self._cache.get("dirty")
+        if cached is not None and time.monotonic() - cached[1] < self.DIRTY_TTL:
+            return cached[0]
+        
+        return self.snapshot().dirty
 
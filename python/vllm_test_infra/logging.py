@@ -1,18 +1,100 @@
 """Logging management for vLLM test infrastructure."""
 
+import functools
 import logging
 import os
+import re
+import select
 import sys
+import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, TextIO
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Pattern, TextIO, Tuple
 
 from .utils import timestamp
 
+# inotify event mask for "file was written to" (from <sys/inotify.h>)
+_IN_MODIFY = 0x00000002
+
+
+@functools.lru_cache(maxsize=None)
+def _combined_pattern(patterns: Tuple[str, ...]) -> Pattern:
+    """Compile a pattern list into one case-insensitive alternation.
+    
+    Each pattern is wrapped in a named group ``p<index>`` so the match's
+    ``lastgroup`` identifies which one fired.
+    """
+    return re.compile(
+        "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)),
+        re.IGNORECASE,
+    )
+
+
+def read_tail_lines(f: BinaryIO, end: int, num_lines: int, block_size: int = 64 * 1024) -> str:
+    """Read the last lines before `end` from a binary file, backwards in blocks.
+    
+    Memory stays bounded by the tail rather than the whole file.
+    
+    Args:
+        f: Seekable binary file.
+        end: Byte offset to read back from (usually the file size).
+        num_lines: Number of lines to return.
+        block_size: Bytes read per backwards step.
+    
+    Returns:
+        The last `num_lines` lines, decoded with undecodable bytes replaced.
+    """
+    if num_lines <= 0:
+        return ""
+    
+    pos = end
+    blocks = []
+    newlines = 0
+    while pos > 0 and newlines <= num_lines:
+        size = min(block_size, pos)
+        pos -= size
+        f.seek(pos)
+        block = f.read(size)
+        blocks.append(block)
+        newlines += block.count(b"\n")
+    
+    lines = b"".join(reversed(blocks)).splitlines(keepends=True)
+    return b"".join(lines[-num_lines:]).decode(errors="replace")
+
+
+def _inotify_watch(path: Path) -> Optional[int]:
+    """Open a non-blocking inotify fd that becomes readable when `path` is written.
+    
+    Args:
+        path: File to watch.
+    
+    Returns:
+        The inotify file descriptor, or None where inotify is unavailable
+        (non-Linux platforms, no libc, watch limit reached).
+    """
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(str(path)), _IN_MODIFY) < 0:
+        os.close(fd)
+        return None
+    return fd
+
 
 class LogManager:
     """Manages log files and logging configuration."""
     
+    # Block size for reading log tails backwards from EOF
+    TAIL_BLOCK_SIZE = 64 * 1024
+    
     def __init__(self, log_dir: str):
         """Initialize LogManager.
         
@@ -22,6 +104,9 @@ class LogManager:
         self.log_dir = Path(log_dir)
         self.log_files = {}
         self._loggers = {}
+        # Persistent read handles for polled logs: name -> (file, (st_dev, st_ino))
+        self._readers: Dict[str, Tuple[BinaryIO, Tuple[int, int]]] = {}
+        self._readers_lock = threading.Lock()
     
     def setup(self) -> None:
         """Create log directories and initialize log files."""
@@ -47,10 +132,25 @@ class LogManager:
         Returns:
             Path to initialized log file.
         """
-        log_path = self.get_log_path(name)
-        log_path.write_text("")  # Truncate
-        self.log_files[name] = log_path
-        return log_path
+        return self.init_log_files([name])[name]
+    
+    def init_log_files(self, names: Iterable[str]) -> Dict[str, Path]:
+        """Initialize several log files at once (truncate if they exist).
+        
+        Args:
+            names: Log file names.
+        
+        Returns:
+            Dict of name -> path of each initialized log file.
+        """
+        paths = {}
+        for name in names:
+            log_path = self.log_dir / f"{name}.log"
+            # O_TRUNC open/close without going through a text wrapper
+            os.close(os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
+            paths[name] = log_path
+        self.log_files.update(paths)
+        return paths
     
     def get_logger(self, name: str, log_to_file: Optional[str] = None) -> logging.Logger:
         """Get or create a logger.
@@ -118,6 +218,47 @@ class LogManager:
             sys.stdout = old_stdout
             sys.stderr = old_stderr
     
+    @contextmanager
+    def _reader(self, name: str) -> Iterator[Tuple[BinaryIO, int]]:
+        """Borrow the persistent binary read handle for a log file.
+        
+        The handle is reopened only if the path now names a different file
+        (deleted and recreated); otherwise one stat() replaces an open/close.
+        
+        Args:
+            name: Log file name.
+        
+        Yields:
+            Tuple of (binary file object, current file size).
+        
+        Raises:
+            OSError: If the log file does not exist.
+        """
+        log_path = self.get_log_path(name)
+        with self._readers_lock:
+            st = os.stat(log_path)
+            identity = (st.st_dev, st.st_ino)
+            entry = self._readers.get(name)
+            if entry is None or entry[1] != identity:
+                if entry is not None:
+                    entry[0].close()
+                entry = (open(log_path, 'rb'), identity)
+                self._readers[name] = entry
+            yield entry[0], st.st_size
+    
+    def close(self, name: Optional[str] = None) -> None:
+        """Close persistent read handles.
+        
+        Args:
+            name: Log file name to close, or None for all of them.
+        """
+        with self._readers_lock:
+            names = [name] if name is not None else list(self._readers)
+            for n in names:
+                entry = self._readers.pop(n, None)
+                if entry is not None:
+                    entry[0].close()
+    
     def tail_file(self, name: str, num_lines: int = 50) -> str:
         """Get the last N lines of a log file.
         
@@ -128,15 +269,12 @@ class LogManager:
         Returns:
             Last N lines of the file as a string.
         """
-        log_path = self.get_log_path(name)
-        
-        if not log_path.exists():
+        if num_lines <= 0:
             return ""
         
         try:
-            with open(log_path, 'r') as f:
-                lines = f.readlines()
-                return ''.join(lines[-num_lines:])
+            with self._reader(name) as (f, size):
+                return read_tail_lines(f, size, num_lines, self.TAIL_BLOCK_SIZE)
         except Exception:
             return ""
     
@@ -154,19 +292,71 @@ class LogManager:
         
         # Wait for file to exist
         while not log_path.exists():
-            import time
             time.sleep(0.1)
         
-        with open(log_path, 'r') as f:
-            f.seek(start_pos)
-            while True:
-                line = f.readline()
-                if line:
-                    yield line
-                else:
-                    # No new data, sleep briefly
-                    import time
-                    time.sleep(0.1)
+        # Block on inotify until the file grows; fall back to polling without it
+        watch_fd = _inotify_watch(log_path)
+        try:
+            with open(log_path, 'r') as f:
+                f.seek(start_pos)
+                while True:
+                    line = f.readline()
+                    if line:
+                        yield line
+                    elif watch_fd is None:
+                        time.sleep(0.1)
+                    else:
+                        # Timeout is only a safety net (e.g. file replaced under us)
+                        if select.select([watch_fd], [], [], 1.0)[0]:
+                            try:
+                                os.read(watch_fd, 4096)
+                            except BlockingIOError:
+                                pass
+        finally:
+            if watch_fd is not None:
+                os.close(watch_fd)
+    
+    def scan_file_for_patterns(self, name: str, patterns: List[str],
+                               start_pos: int = 0) -> Tuple[Optional[Tuple[str, str]], int]:
+        """Incrementally search a growing log file for error patterns.
+        
+        Only complete lines are consumed, so a line still being written is
+        picked up whole by the next call.
+        
+        Args:
+            name: Log file name.
+            patterns: List of regex patterns to search for.
+            start_pos: Byte offset to resume from (the position returned by
+                the previous call, or 0). Reset to 0 if the file shrank.
+        
+        Returns:
+            Tuple of ((pattern, matching_line) or None, position to resume
+            from on the next call).
+        """
+        if not patterns:
+            return None, start_pos
+        
+        patterns = tuple(patterns)
+        combined = _combined_pattern(patterns)
+        pos = start_pos
+        
+        try:
+            with self._reader(name) as (f, size):
+                if pos > size:
+                    pos = 0
+                f.seek(pos)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    pos += len(raw)
+                    line = raw.decode(errors="replace")
+                    match = combined.search(line)
+                    if match:
+                        return (patterns[int(match.lastgroup[1:])], line.strip()), pos
+        except OSError:
+            pass
+        
+        return None, pos
     
     def search_file_for_patterns(self, name: str, patterns: list[str], 
                                   start_pos: int = 0) -> Optional[tuple[str, str]]:
@@ -180,22 +370,22 @@ class LogManager:
         Returns:
             Tuple of (pattern, matching_line) if found, None otherwise.
         """
-        import re
-        
         log_path = self.get_log_path(name)
         
-        if not log_path.exists():
+        if not log_path.exists() or not patterns:
             return None
         
-        compiled_patterns = [(p, re.compile(p, re.IGNORECASE)) for p in patterns]
+        # One compiled alternation (cached per pattern list) instead of a regex per pattern
+        patterns = tuple(patterns)
+        combined = _combined_pattern(patterns)
         
         try:
             with open(log_path, 'r') as f:
                 f.seek(start_pos)
                 for line in f:
-                    for pattern_str, pattern_re in compiled_patterns:
-                        if pattern_re.search(line):
-                            return (pattern_str, line.strip())
+                    match = combined.search(line)
+                    if match:
+                        return (patterns[int(match.lastgroup[1:])], line.strip())
         except Exception:
             pass
         
@@ -2,16 +2,65 @@
 
 import atexit
 import os
+import select
 import signal
 import subprocess
 import time
+import weakref
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .logging import LogManager
 from .signal_handler import register_cleanup
 from .utils import cleanup_zombie_processes, note
 
+# Managers alive in this process. The exit/signal hooks are installed once
+# and fan out over this set instead of being registered per instance.
+_live_managers: "weakref.WeakSet[ProcessManager]" = weakref.WeakSet()
+_hooks_installed = False
+
+
+def _terminate_live_managers() -> None:
+    """Terminate the processes of every live ProcessManager."""
+    for manager in list(_live_managers):
+        manager.terminate_all()
+
+
+def _cleanup_live_managers() -> None:
+    """atexit hook: terminate managed processes, then sweep zombies once."""
+    if not _live_managers:
+        return
+    note("Running process cleanup...")
+    _terminate_live_managers()
+    cleanup_zombie_processes()
+
+
+def _signal_handler(signum, frame):
+    """Handle termination signals."""
+    note(f"Received signal {signum}, cleaning up...")
+    _terminate_live_managers()
+    # Re-raise to allow normal signal handling
+    if signum == signal.SIGINT:
+        raise KeyboardInterrupt()
+
+
+def _install_hooks() -> None:
+    """Install the process-wide atexit/signal hooks (first call only)."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    
+    # Register cleanup on exit (atexit as fallback)
+    atexit.register(_cleanup_live_managers)
+    
+    # Register with global signal handler for coordinated cleanup
+    register_cleanup(_terminate_live_managers)
+    
+    # Keep local signal handlers as additional safety
+    signal.signal(signal.SIGINT, _signal_handler)
+    signal.signal(signal.SIGTERM, _signal_handler)
+    _hooks_installed = True
+
 
 class ProcessManager:
     """Manages subprocess execution and monitoring."""
@@ -24,27 +73,12 @@ class ProcessManager:
         """
         self.log_manager = log_manager
         self.processes: Dict[str, subprocess.Popen] = {}
-        self._cleanup_registered = False
-        
-        # Register cleanup on exit (atexit as fallback)
-        if not self._cleanup_registered:
-            atexit.register(self.cleanup_on_exit)
-            self._cleanup_registered = True
+        # name -> (pid, pidfd) for processes waited on via wait_for_exit()
+        self._pidfds: Dict[str, Tuple[int, int]] = {}
         
-        # Register with global signal handler for coordinated cleanup
-        register_cleanup(self.terminate_all)
-        
-        # Keep local signal handlers as additional safety
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-    
-    def _signal_handler(self, signum, frame):
-        """Handle termination signals."""
-        note(f"Received signal {signum}, cleaning up...")
-        self.terminate_all()
-        # Re-raise to allow normal signal handling
-        if signum == signal.SIGINT:
-            raise KeyboardInterrupt()
+        # Exit/signal cleanup is shared by all managers in the process
+        _live_managers.add(self)
+        _install_hooks()
     
     def run(self, 
             name: str,
@@ -72,32 +106,53 @@ class ProcessManager:
             subprocess.TimeoutExpired: If timeout is exceeded.
             subprocess.CalledProcessError: If command returns non-zero exit code.
         """
-        full_env = os.environ.copy()
-        if env:
-            full_env.update(env)
+        # Without an overlay the child inherits os.environ; skip the copy
+        full_env = {**os.environ, **env} if env else None
         
         note(f"Running {name}: {' '.join(command)}")
         
         # Determine output handling
         stdout_dest = subprocess.PIPE if capture_output else None
         stderr_dest = subprocess.PIPE if capture_output else None
+        log_fd = None
         
         if log_file and self.log_manager:
+            # Hand the child a raw fd so output goes straight to disk
             log_path = self.log_manager.get_log_path(log_file)
-            stdout_dest = open(log_path, 'a')
+            log_fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            stdout_dest = log_fd
             stderr_dest = subprocess.STDOUT
         
         try:
-            result = subprocess.run(
+            # Own process group so a timeout/signal can take down the whole tree
+            process = subprocess.Popen(
                 command,
                 env=full_env,
                 cwd=cwd,
-                timeout=timeout,
                 stdout=stdout_dest,
                 stderr=stderr_dest,
+                start_new_session=True,
                 text=True
             )
             
+            # Track it so terminate_all() reaches it, without clobbering a
+            # background process that was registered under the same name
+            key = name if name not in self.processes else f"{name}:{process.pid}"
+            self.processes[key] = process
+            
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                note(f"{name} timed out after {timeout}s")
+                self.terminate(key)
+                process.communicate()  # Reap the child and close any pipes
+                raise
+            finally:
+                if self.processes.get(key) is process:
+                    self._untrack(key)
+            
+            result = subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+            
             if result.returncode != 0:
                 note(f"{name} exited with code {result.returncode}")
             else:
@@ -107,9 +162,8 @@ class ProcessManager:
         
         finally:
             # Close log file if we opened it
-            if log_file and self.log_manager and not capture_output:
-                if stdout_dest and hasattr(stdout_dest, 'close'):
-                    stdout_dest.close()
+            if log_fd is not None:
+                os.close(log_fd)
     
     def run_background(self,
                        name: str,
@@ -129,9 +183,8 @@ class ProcessManager:
         Returns:
             Popen instance for the running process.
         """
-        full_env = os.environ.copy()
-        if env:
-            full_env.update(env)
+        # Without an overlay the child inherits os.environ; skip the copy
+        full_env = {**os.environ, **env} if env else None
         
         note(f"Starting background process {name}: {' '.join(command)}")
         
@@ -175,6 +228,67 @@ class ProcessManager:
         process = self.processes[name]
         return process.poll() is None
     
+    # Shutdown escalation: (signal, seconds to wait, message on exit)
+    _ESCALATION = (
+        (signal.SIGINT, 5, "terminated gracefully"),
+        (signal.SIGTERM, 3, "terminated with SIGTERM"),
+        (signal.SIGKILL, 2, "killed with SIGKILL"),
+    )
+    
+    def _untrack(self, name: str) -> None:
+        """Stop tracking a named process and release its pidfd."""
+        self.processes.pop(name, None)
+        entry = self._pidfds.pop(name, None)
+        if entry is not None:
+            os.close(entry[1])
+    
+    def _pidfd(self, name: str, process: subprocess.Popen) -> Optional[int]:
+        """Get a pidfd for a tracked process, opening it on first use.
+        
+        Returns:
+            The pidfd, or None where pidfd_open is unavailable (Python < 3.9,
+            Linux < 5.3, other platforms).
+        """
+        entry = self._pidfds.get(name)
+        if entry is not None:
+            if entry[0] == process.pid:
+                return entry[1]
+            # Name was reused for a new process
+            os.close(entry[1])
+            del self._pidfds[name]
+        
+        if not hasattr(os, "pidfd_open"):
+            return None
+        try:
+            fd = os.pidfd_open(process.pid)
+        except OSError:
+            return None
+        self._pidfds[name] = (process.pid, fd)
+        return fd
+    
+    def wait_for_exit(self, name: str, timeout: float) -> bool:
+        """Block until a named process exits or the timeout elapses.
+        
+        On Linux this waits on a pidfd, so a crash wakes the caller at once
+        instead of at the end of its sleep; elsewhere it just sleeps.
+        
+        Args:
+            name: Process name.
+            timeout: Maximum time to wait in seconds.
+        
+        Returns:
+            True if the process exited (or is not tracked), False on timeout.
+        """
+        process = self.processes.get(name)
+        if process is None or process.poll() is not None:
+            return True
+        
+        fd = self._pidfd(name, process)
+        if fd is None:
+            time.sleep(timeout)
+            return process.poll() is not None
+        return bool(select.select([fd], [], [], timeout)[0])
+    
     def terminate(self, name: str, timeout: int = 10) -> bool:
         """Terminate a named process gracefully.
         
@@ -192,7 +306,7 @@ class ProcessManager:
         
         if process.poll() is not None:
             # Already dead
-            del self.processes[name]
+            self._untrack(name)
             return False
         
         note(f"Terminating {name} (PID {process.pid})...")
@@ -208,7 +322,7 @@ class ProcessManager:
         try:
             process.wait(timeout=5)
             note(f"{name} terminated gracefully")
-            del self.processes[name]
+            self._untrack(name)
             return True
         except subprocess.TimeoutExpired:
             pass
@@ -218,7 +332,7 @@ class ProcessManager:
             os.killpg(os.getpgid(process.pid), signal.SIGTERM)
             process.wait(timeout=3)
             note(f"{name} terminated with SIGTERM")
-            del self.processes[name]
+            self._untrack(name)
             return True
         except (subprocess.TimeoutExpired, ProcessLookupError, PermissionError):
             pass
@@ -231,7 +345,7 @@ class ProcessManager:
         except (ProcessLookupError, PermissionError):
             pass
         
-        del self.processes[name]
+        self._untrack(name)
         return True
     
     def terminate_all(self) -> None:
@@ -241,17 +355,46 @@ class ProcessManager:
         
         note("Terminating all processes...")
         
-        # Make a copy of process names to avoid dict modification during iteration
-        process_names = list(self.processes.keys())
-        
-        for name in process_names:
-            self.terminate(name)
+        # Collect live processes (copy to avoid dict modification during iteration)
+        pending = {}
+        for name, process in list(self.processes.items()):
+            if process.poll() is None:
+                note(f"Terminating {name} (PID {process.pid})...")
+                pending[name] = process
+            else:
+                self._untrack(name)
+        
+        # Escalate all processes in lockstep: signal every survivor, then wait
+        # against one shared deadline, so total time is the max, not the sum
+        for sig, grace, message in self._ESCALATION:
+            if not pending:
+                break
+            for process in pending.values():
+                try:
+                    os.killpg(os.getpgid(process.pid), sig)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            
+            deadline = time.monotonic() + grace
+            for name, process in list(pending.items()):
+                try:
+                    process.wait(timeout=max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    continue
+                note(f"{name} {message}")
+                del pending[name]
+        
+        for name in pending:
+            note(f"WARNING: {name} (PID {pending[name].pid}) did not exit after SIGKILL")
+        for name, process in list(self.processes.items()):
+            if process.poll() is not None or name in pending:
+                self._untrack(name)
         
         # Give processes time to die
         time.sleep(1)
     
     def cleanup_on_exit(self) -> None:
-        """Cleanup function registered with atexit."""
+        """Terminate this manager's processes and sweep zombie processes."""
         note("Running process cleanup...")
         
         # Terminate all managed processes
@@ -3,10 +3,12 @@
 import os
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .logging import LogManager
 from .process import ProcessManager
@@ -15,6 +17,7 @@ from .utils import (
     extract_tp_dp_from_args,
     is_chg_available,
     note,
+    parse_env_csv,
     split_args_string,
 )
 
@@ -48,7 +51,8 @@ class VLLMServer:
                  port: int = 8000,
                  venv_path: Optional[str] = None,
                  log_manager: Optional[LogManager] = None,
-                 process_manager: Optional[ProcessManager] = None):
+                 process_manager: Optional[ProcessManager] = None,
+                 process_name: str = "vllm_server"):
         """Initialize VLLMServer.
         
         Args:
@@ -58,6 +62,8 @@ class VLLMServer:
             venv_path: Path to virtual environment.
             log_manager: LogManager instance for logging.
             process_manager: ProcessManager instance for process control.
+            process_name: Name the server process is tracked under (must be
+                unique when several servers share a ProcessManager).
         """
         self.model = model
         self.host = host
@@ -65,10 +71,42 @@ class VLLMServer:
         self.venv_path = venv_path
         self.log_manager = log_manager
         self.process_manager = process_manager or ProcessManager(log_manager)
+        self.process_name = process_name
         
         self._server_process = None
+        self._log_file = "server"
         self._server_args = []
         self._extra_env = {}
+        # Byte offset in the server log up to which errors have been scanned
+        self._error_scan_pos = 0
+        # Keep-alive HTTP session for readiness probes (created on first use)
+        self._session: Optional[requests.Session] = None
+        # Runs the /health and /v1/models probes side by side (created on first use)
+        self._probe_pool: Optional[ThreadPoolExecutor] = None
+    
+    def _get_session(self) -> requests.Session:
+        """Get the keep-alive session used for readiness probes."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+    
+    def _probe(self, url: str) -> bool:
+        """Check whether an endpoint answers 200.
+        
+        Args:
+            url: Endpoint URL.
+        
+        Returns:
+            True if the endpoint responded with HTTP 200.
+        """
+        try:
+            return self._get_session().get(url, timeout=2).status_code == 200
+        except requests.RequestException:
+            return False
     
     def _get_vllm_command(self) -> str:
         """Get path to vllm command."""
@@ -80,39 +118,40 @@ class VLLMServer:
         # Fallback to system vllm
         return "vllm"
     
-    def _build_command(self, args: str, env_csv: str = "") -> Tuple[List[str], Dict[str, str]]:
+    def _build_command(self, args: Union[str, List[str]],
+                       env_csv: Union[str, Dict[str, str]] = "") -> Tuple[List[str], Dict[str, str]]:
         """Build server command with GPU allocation.
         
         Args:
-            args: Space-separated server arguments.
-            env_csv: Comma-separated environment variables (K=V,K2=V2).
+            args: Server arguments, as a space-separated string or argv list.
+            env_csv: Comma-separated environment variables (K=V,K2=V2),
+                or an already-parsed dict.
         
         Returns:
             Tuple of (command_list, env_dict).
         """
         # Parse environment variables
-        env_dict = {}
-        if env_csv:
-            for kv in env_csv.split(','):
-                kv = kv.strip()
-                if '=' in kv:
-                    key, value = kv.split('=', 1)
-                    env_dict[key.strip()] = value.strip()
+        if isinstance(env_csv, str):
+            env_dict = parse_env_csv(env_csv) if env_csv else {}
+        else:
+            env_dict = dict(env_csv)
+        
+        arg_list = split_args_string(args) if isinstance(args, str) else list(args)
         
         # Extract GPU requirements from args
-        tp_size, dp_size = extract_tp_dp_from_args(args)
+        tp_size, dp_size = extract_tp_dp_from_args(arg_list)
         gpu_count = compute_gpu_count(tp_size, dp_size)
         
         # Build base command
         vllm_cmd = self._get_vllm_command()
-        arg_list = split_args_string(args) if args else []
         
         command = [vllm_cmd, "serve", self.model, "--host", self.host, "--port", str(self.port)]
         command.extend(arg_list)
         
         # Add GPU launcher prefix if chg is available and GPUs are needed
-        if gpu_count > 1 or (gpu_count == 1 and is_chg_available()):
-            if is_chg_available():
+        chg_available = is_chg_available()
+        if gpu_count > 1 or (gpu_count == 1 and chg_available):
+            if chg_available:
                 note(f"Using chg to reserve {gpu_count} GPU(s)")
                 command = ["chg", "run", "-g", str(gpu_count), "--"] + command
             else:
@@ -121,26 +160,36 @@ class VLLMServer:
         return command, env_dict
     
     def start(self, 
-              args: str = "",
-              env_csv: str = "",
+              args: Union[str, List[str]] = "",
+              env_csv: Union[str, Dict[str, str]] = "",
               log_file: str = "server") -> None:
         """Start the vLLM server.
         
         Args:
-            args: Space-separated server arguments.
-            env_csv: Comma-separated environment variables.
+            args: Server arguments, as a space-separated string or argv list.
+            env_csv: Comma-separated environment variables, or an
+                already-parsed dict.
             log_file: Log file name for server output.
         
         Raises:
             VLLMServerError: If server is already running or fails to start.
         """
-        if self._server_process and self.process_manager.is_running("vllm_server"):
+        if self._server_process and self.process_manager.is_running(self.process_name):
             raise VLLMServerError("Server is already running")
         
         # Build command
         command, env_dict = self._build_command(args, env_csv)
-        self._server_args = args
+        self._server_args = args if isinstance(args, str) else list(args)
         self._extra_env = env_dict
+        self._log_file = log_file
+        
+        # The log is appended to, so only scan what this server writes
+        self._error_scan_pos = 0
+        if self.log_manager:
+            try:
+                self._error_scan_pos = self.log_manager.get_log_path(log_file).stat().st_size
+            except OSError:
+                pass
         
         note(f"Starting vLLM server: {' '.join(command)}")
         if env_dict:
@@ -148,7 +197,7 @@ class VLLMServer:
         
         # Start server process
         self._server_process = self.process_manager.run_background(
-            name="vllm_server",
+            name=self.process_name,
             command=command,
             env=env_dict,
             log_file=log_file
@@ -171,29 +220,32 @@ class VLLMServer:
         models_url = f"http://{self.host}:{self.port}/v1/models"
         start_time = time.time()
         last_log_check = 0
+        if self._probe_pool is None:
+            self._probe_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vllm_probe")
         
         note(f"Waiting for server at {health_url} (timeout: {timeout}s)...")
         
         while time.time() - start_time < timeout:
             # Check if process is still alive
-            if not self.process_manager.is_running("vllm_server"):
+            if not self.process_manager.is_running(self.process_name):
                 error_msg = "Server process died unexpectedly"
                 if self.log_manager:
-                    log_tail = self.log_manager.tail_file("server", num_lines=100)
+                    log_tail = self.log_manager.tail_file(self._log_file, num_lines=100)
                     error_msg += f"\n\nLast 100 lines of server log:\n{log_tail}"
                 raise VLLMServerError(error_msg)
             
             # Check logs for errors periodically (every 2 seconds)
             current_time = time.time()
             if self.log_manager and current_time - last_log_check >= 2.0:
-                error = self.log_manager.search_file_for_patterns(
-                    "server",
+                # Incremental: only bytes appended since the last check are scanned
+                error, self._error_scan_pos = self.log_manager.scan_file_for_patterns(
+                    self._log_file,
                     self.ERROR_PATTERNS,
-                    start_pos=0
+                    start_pos=self._error_scan_pos
                 )
                 if error:
                     pattern, line = error
-                    log_tail = self.log_manager.tail_file("server", num_lines=100)
+                    log_tail = self.log_manager.tail_file(self._log_file, num_lines=100)
                     raise VLLMServerError(
                         f"Fatal error detected in server logs:\n"
                         f"  Pattern: {pattern}\n"
@@ -202,36 +254,37 @@ class VLLMServer:
                     )
                 last_log_check = current_time
             
-            # Check health endpoint
-            try:
-                response = requests.get(health_url, timeout=2)
-                if response.status_code == 200:
+            # Probe health and models endpoints concurrently; first 200 wins
+            probes = [self._probe_pool.submit(self._probe, url) for url in (health_url, models_url)]
+            for probe in as_completed(probes):
+                if probe.result():
+                    for other in probes:
+                        other.cancel()
                     note("Server is ready!")
                     return True
-            except requests.RequestException:
-                pass
             
-            # Also try models endpoint as fallback
-            try:
-                response = requests.get(models_url, timeout=2)
-                if response.status_code == 200:
-                    note("Server is ready!")
-                    return True
-            except requests.RequestException:
-                pass
-            
-            time.sleep(check_interval)
+            # Sleep until the next tick, waking early if the server process dies
+            self.process_manager.wait_for_exit(self.process_name, check_interval)
         
         note(f"WARNING: Server did not become ready after {timeout}s")
         return False
     
     def stop(self) -> None:
         """Stop the vLLM server gracefully."""
+        if self._probe_pool is not None:
+            self._probe_pool.shutdown(wait=False)
+            self._probe_pool = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        
         if not self._server_process:
             return
         
-        self.process_manager.terminate("vllm_server")
+        self.process_manager.terminate(self.process_name)
         self._server_process = None
+        if self.log_manager:
+            self.log_manager.close(self._log_file)
     
     def is_running(self) -> bool:
         """Check if server is running.
@@ -239,9 +292,10 @@ class VLLMServer:
         Returns:
             True if server process is alive.
         """
-        return self.process_manager.is_running("vllm_server")
+        return self.process_manager.is_running(self.process_name)
     
-    def restart(self, args: Optional[str] = None, env_csv: Optional[str] = None) -> None:
+    def restart(self, args: Optional[Union[str, List[str]]] = None,
+                env_csv: Optional[Union[str, Dict[str, str]]] = None) -> None:
         """Restart the server with same or new configuration.
         
         Args:
@@ -254,9 +308,9 @@ class VLLMServer:
         if args is None:
             args = self._server_args
         if env_csv is None:
-            env_csv = ','.join(f"{k}={v}" for k, v in self._extra_env.items())
+            env_csv = self._extra_env
         
-        self.start(args=args, env_csv=env_csv)
+        self.start(args=args, env_csv=env_csv, log_file=self._log_file)
     
     def __enter__(self):
         """Context manager entry."""
@@ -7,6 +7,7 @@ from typing import Callable, Optional
 
 _cleanup_handlers = []
 _signal_received = False
+_cleanup_done = False
 
 
 def register_cleanup(handler: Callable[[], None]) -> None:
@@ -21,8 +22,16 @@ def register_cleanup(handler: Callable[[], None]) -> None:
 
 
 def _run_cleanup_handlers():
-    """Run all registered cleanup handlers."""
-    global _cleanup_handlers
+    """Run all registered cleanup handlers (once per process).
+    
+    Both the signal path and atexit call this; a signal-triggered
+    sys.exit() would otherwise run every handler a second time.
+    """
+    global _cleanup_handlers, _cleanup_done
+    if _cleanup_done:
+        return
+    _cleanup_done = True
+    
     for handler in _cleanup_handlers:
         try:
             handler()
@@ -1,19 +1,22 @@
 """User interface management for vLLM test infrastructure."""
 
-import queue
+import os
 import sys
 import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import Callable, Dict, Optional
 
 from .logging import LogManager
+from .process import _terminate_live_managers
 from .utils import note
 
 # Textual imports - optional dependency
 try:
     from textual.app import App, ComposeResult
     from textual.containers import Container, Vertical, VerticalScroll
+    from textual.message import Message
     from textual.widgets import Header, Footer, Label, Static, RichLog
     from textual.reactive import reactive
     TEXTUAL_AVAILABLE = True
@@ -22,42 +25,71 @@ except ImportError:
 
 
 class WorkerThread(threading.Thread):
-    """Runs work in background thread, sends updates to TUI via queue."""
+    """Runs work in background thread, reports the outcome via callbacks."""
     
-    def __init__(self, work_func: Callable[[], int], 
-                 update_queue: queue.Queue,
-                 exception_queue: queue.Queue):
+    def __init__(self, work_func: Callable[[], int],
+                 on_complete: Callable[[int], None],
+                 on_error: Callable[[Exception], None],
+                 cancel_event: Optional[threading.Event] = None):
         """Initialize WorkerThread.
         
         Args:
             work_func: Function that does the work, returns exit code.
-            update_queue: Queue for sending status updates to TUI.
-            exception_queue: Queue for sending exceptions to TUI.
+            on_complete: Called (in the worker thread) with the exit code.
+            on_error: Called (in the worker thread) with the exception if
+                work_func raises.
+            cancel_event: Event set to ask work_func to stop early (a new
+                one is created if None).
         """
+        # Still a daemon as a last resort, should cancel() time out
         super().__init__(daemon=True)
         self.work_func = work_func
-        self.update_queue = update_queue
-        self.exception_queue = exception_queue
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self._cancel = cancel_event or threading.Event()
         self._exit_code = None
     
     def run(self) -> None:
         """Run the work function and report results."""
         try:
             self._exit_code = self.work_func()
-            self.update_queue.put(("complete", self._exit_code))
         except Exception as e:
-            self.exception_queue.put(e)
-            self.update_queue.put(("error", str(e)))
+            self.on_error(e)
+        else:
+            self.on_complete(self._exit_code)
     
     def get_exit_code(self) -> Optional[int]:
         """Get the exit code from the work function."""
         return self._exit_code
+    
+    def cancel(self, timeout: float = 5.0) -> None:
+        """Stop the work function and wait for the thread to finish.
+        
+        Sets the cancel event, then terminates every managed subprocess so
+        that work blocked on a server or client returns promptly.
+        
+        Args:
+            timeout: Maximum time to wait for the thread, in seconds.
+        """
+        if not self.is_alive():
+            return
+        self._cancel.set()
+        _terminate_live_managers()
+        self.join(timeout=timeout)
 
 
 if TEXTUAL_AVAILABLE:
     class LogPane(VerticalScroll):
         """A widget that displays log file contents with auto-refresh."""
         
+        # Bytes read from the log per read() call
+        READ_SIZE = 64 * 1024
+        # Most new bytes rendered per tick; older output in a burst is elided
+        MAX_TICK_BYTES = 256 * 1024
+        # A write slower than this backs off the following ticks
+        SLOW_RENDER_S = 0.05
+        MAX_SKIP_TICKS = 8
+        
         def __init__(self, log_path: Path, title: str, **kwargs):
             """Initialize LogPane.
             
@@ -70,6 +102,12 @@ if TEXTUAL_AVAILABLE:
             self.title_text = title
             self.last_position = 0
             self.rich_log = None
+            # Log file kept open across ticks, and the unterminated last line
+            self._fh = None
+            self._pending = b""
+            # Adaptive throttling: ticks left to skip, and the current backoff
+            self._skip_ticks = 0
+            self._backoff = 0
         
         def compose(self) -> ComposeResult:
             """Create child widgets."""
@@ -83,26 +121,92 @@ if TEXTUAL_AVAILABLE:
             # Set up interval to update logs
             self.set_interval(0.5, self._update_content)
         
+        def on_unmount(self) -> None:
+            """Close the log file."""
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        
         def _update_content(self) -> None:
             """Read new content from log file."""
-            if not self.log_path.exists():
+            if self._skip_ticks:
+                self._skip_ticks -= 1
                 return
             
             try:
-                with open(self.log_path, 'r') as f:
-                    f.seek(self.last_position)
-                    new_content = f.read()
-                    if new_content and self.rich_log:
-                        # Write new content to RichLog (it handles auto-scroll)
-                        self.rich_log.write(new_content, expand=True)
-                        self.last_position = f.tell()
-            except Exception:
-                pass
+                if self._fh is None:
+                    self._fh = open(self.log_path, 'rb')
+                
+                if os.fstat(self._fh.fileno()).st_size < self.last_position:
+                    # Log was truncated, start over
+                    self._fh.seek(0)
+                    self.last_position = 0
+                    self._pending = b""
+                
+                # Keep only the newest MAX_TICK_BYTES of a burst, counting the
+                # lines that fall off the front
+                chunks = deque([self._pending])
+                retained = len(self._pending)
+                elided = 0
+                while True:
+                    chunk = self._fh.read(self.READ_SIZE)
+                    chunks.append(chunk)
+                    retained += len(chunk)
+                    self.last_position += len(chunk)
+                    while retained - len(chunks[0]) >= self.MAX_TICK_BYTES:
+                        dropped = chunks.popleft()
+                        retained -= len(dropped)
+                        elided += dropped.count(b"\n")
+                    if len(chunk) < self.READ_SIZE:
+                        break
+            except OSError:
+                return
+            
+            data = b"".join(chunks)
+            start = 0
+            if elided:
+                # Also drop the line that eliding cut in half
+                start = data.find(b"\n") + 1
+                elided += 1 if start else 0
+            
+            # Hand complete lines to RichLog in one write per tick; keep a
+            # trailing partial line for the next tick unless it is huge
+            cut = data.rfind(b"\n") + 1
+            if len(data) - cut >= self.READ_SIZE:
+                cut = len(data)
+            self._pending = data[cut:]
+            
+            if not (cut or elided) or not self.rich_log:
+                return
+            
+            # Drop the final newline, RichLog starts each write on a new line
+            text = data[start:cut - 1] if data[cut - 1:cut] == b"\n" else data[start:cut]
+            if elided:
+                text = f"... [{elided} lines elided] ...\n".encode() + text
+            
+            # RichLog handles auto-scroll
+            render_start = time.perf_counter()
+            self.rich_log.write(text.decode(errors="replace"), expand=True)
+            
+            # Back off exponentially while rendering is slow
+            if time.perf_counter() - render_start > self.SLOW_RENDER_S:
+                self._backoff = min(self.MAX_SKIP_TICKS, self._backoff * 2 + 1)
+                self._skip_ticks = self._backoff
+            else:
+                self._backoff = 0
 
 
     class TestRunnerApp(App):
         """Textual app for displaying test logs with worker thread."""
         
+        class WorkDone(Message):
+            """Posted by the worker thread when the work function finishes."""
+            
+            def __init__(self, exit_code: int, error: Optional[Exception] = None):
+                super().__init__()
+                self.exit_code = exit_code
+                self.error = error
+        
         CSS = """
         Screen {
             layout: grid;
@@ -155,6 +259,7 @@ if TEXTUAL_AVAILABLE:
                      log_manager: LogManager,
                      panes: Dict[str, str],
                      work_func: Callable[[], int],
+                     cancel_event: Optional[threading.Event] = None,
                      **kwargs):
             """Initialize TestRunnerApp.
             
@@ -162,16 +267,15 @@ if TEXTUAL_AVAILABLE:
                 log_manager: LogManager instance.
                 panes: Dict of pane_id -> log_file_name mappings.
                 work_func: Function that does the work.
+                cancel_event: Event set when the app closes before the
+                    work is done.
             """
             super().__init__(**kwargs)
             self.log_manager = log_manager
             self.panes_config = panes
             self.work_func = work_func
+            self.cancel_event = cancel_event
             self.log_panes = {}
-            
-            # Queues for communication with worker thread
-            self.update_queue = queue.Queue()
-            self.exception_queue = queue.Queue()
             self.worker_thread = None
             self.exit_code = 0
         
@@ -190,49 +294,29 @@ if TEXTUAL_AVAILABLE:
         
         def on_mount(self) -> None:
             """Start worker thread when app is mounted."""
-            # Start worker thread
+            # Start worker thread; it wakes the UI by posting a message
+            # (thread-safe, and non-blocking if the app has already exited)
             self.worker_thread = WorkerThread(
                 self.work_func,
-                self.update_queue,
-                self.exception_queue
+                on_complete=lambda exit_code: self.post_message(self.WorkDone(exit_code)),
+                on_error=lambda exc: self.post_message(self.WorkDone(1, exc)),
+                cancel_event=self.cancel_event,
             )
             self.worker_thread.start()
-            
-            # Set up interval to check queue
-            self.set_interval(0.1, self._check_queue)
         
-        def _check_queue(self) -> None:
-            """Check queue for messages from worker thread."""
-            try:
-                # Non-blocking queue check
-                while True:
-                    msg_type, msg_data = self.update_queue.get_nowait()
-                    
-                    if msg_type == "complete":
-                        self.exit_code = msg_data
-                        self.exit()
-                    elif msg_type == "error":
-                        self.exit_code = 1
-                        # Show error in UI before exiting
-                        note(f"Error: {msg_data}")
-                        self.exit()
-            
-            except queue.Empty:
-                pass
-            
-            # Check for exceptions
-            try:
-                exc = self.exception_queue.get_nowait()
-                note(f"Exception in worker thread: {exc}")
-                self.exit_code = 1
-                self.exit()
-            except queue.Empty:
-                pass
+        def on_test_runner_app_work_done(self, message: "TestRunnerApp.WorkDone") -> None:
+            """Exit with the worker's result."""
+            if message.error is not None:
+                note(f"Exception in worker thread: {message.error}")
+            self.exit_code = message.exit_code
+            self.exit()
         
         def on_unmount(self) -> None:
             """Cleanup when app closes."""
-            # Worker thread is daemon, will be killed automatically
-            pass
+            # Quit before the work finished: stop it (and the servers it
+            # launched) rather than leaving them to the zombie sweep
+            if self.worker_thread is not None:
+                self.worker_thread.cancel()
 else:
     # Dummy classes when Textual is not available
     LogPane = None
@@ -254,6 +338,9 @@ class UIManager:
         self.log_manager = log_manager
         self.mode = mode
         self._app = None
+        # Set when the TUI is closed before the work function returns;
+        # long-running work functions can poll it between steps
+        self.cancel_event = threading.Event()
         
         # Auto-detect mode if requested
         if self.mode == "auto":
@@ -294,7 +381,8 @@ class UIManager:
         
         try:
             note("Starting TUI...")
-            app = TestRunnerApp(self.log_manager, panes, work_func)
+            app = TestRunnerApp(self.log_manager, panes, work_func,
+                                cancel_event=self.cancel_event)
             app.run()
             return app.exit_code
         
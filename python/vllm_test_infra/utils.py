@@ -1,21 +1,109 @@
 """Common utilities for vLLM test infrastructure."""
 
+import functools
 import os
 import re
+import shutil
+import signal
 import subprocess
+import sys
 import time
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+
+# (epoch second, formatted string) of the last timestamp() call
+_timestamp_cache: Tuple[int, str] = (0, "")
 
 
 def timestamp() -> str:
-    """Return formatted timestamp string."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    """Return formatted timestamp string (formatted at most once per second)."""
+    global _timestamp_cache
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        # Swap in a new tuple so concurrent callers never see a torn pair
+        _timestamp_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return _timestamp_cache[1]
 
 
 def note(msg: str) -> None:
     """Print timestamped message."""
-    print(f"[{timestamp()}] {msg}", flush=True)
+    # One write of the whole line (print writes msg and end separately)
+    out = sys.stdout
+    out.write(f"[{timestamp()}] {msg}\n")
+    out.flush()
+
+
+def _user_uid(user: str) -> Optional[int]:
+    """Resolve a user name (or numeric uid string) to a uid."""
+    if user.isdigit():
+        return int(user)
+    try:
+        import pwd
+        return pwd.getpwnam(user).pw_uid
+    except (ImportError, KeyError):
+        return None
+
+
+def _find_matching_processes(patterns: List[str],
+                             user: Optional[str] = None) -> Optional[List[Tuple[int, str]]]:
+    """Find processes whose full command line matches any pattern, via /proc.
+    
+    Does the job of `pkill -f` for all patterns in a single pass, without
+    spawning anything. The calling process itself is never matched.
+    
+    Args:
+        patterns: Regex patterns matched against the space-joined command line.
+        user: Optional user name or uid; only processes with that effective
+            uid are matched.
+    
+    Returns:
+        List of (pid, matching pattern), or None if /proc is unavailable.
+    """
+    if not os.path.isdir("/proc/self"):
+        return None
+    
+    uid = None
+    if user:
+        uid = _user_uid(user)
+        if uid is None:
+            return []
+    
+    combined = re.compile("|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)))
+    own_pid = os.getpid()
+    matches = []
+    
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit() or int(entry.name) == own_pid:
+                continue
+            try:
+                with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                    cmdline = f.read()
+                if uid is not None and os.stat(entry.path).st_uid != uid:
+                    continue
+            except OSError:
+                continue  # Exited meanwhile, or not ours to inspect
+            
+            # Kernel threads have an empty cmdline; pkill -f skips them too
+            if not cmdline:
+                continue
+            match = combined.search(cmdline.rstrip(b"\0").replace(b"\0", b" ").decode(errors="replace"))
+            if match:
+                matches.append((int(entry.name), patterns[int(match.lastgroup[1:])]))
+    
+    return matches
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check via /proc whether a process still runs (zombies count as exited)."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return False
+    # State is the first field after the parenthesised command name
+    state = stat[stat.rfind(b")") + 2:stat.rfind(b")") + 3]
+    return state not in (b"Z", b"X")
 
 
 def cleanup_zombie_processes(user: Optional[str] = None) -> None:
@@ -33,70 +121,113 @@ def cleanup_zombie_processes(user: Optional[str] = None) -> None:
     ]
     
     note("Checking for zombie processes...")
-    killed_any = False
-    
-    for pattern in patterns:
-        try:
-            # pkill with -f matches full command line
-            cmd = ["pkill", "-9", "-f", pattern]
-            if user:
-                cmd.extend(["-u", user])
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                note(f"  Killed processes matching: {pattern}")
-                killed_any = True
-        except Exception as e:
-            # pkill returns non-zero if no processes found, which is fine
-            pass
-    
-    if killed_any:
-        time.sleep(2)  # Give processes time to die
+    
+    matches = _find_matching_processes(patterns, user)
+    if matches is not None:
+        # One /proc sweep for all patterns, SIGKILL sent directly
+        killed_patterns = []
+        killed_pids = []
+        for pid, pattern in matches:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                continue
+            killed_pids.append(pid)
+            if pattern not in killed_patterns:
+                killed_patterns.append(pattern)
+        for pattern in killed_patterns:
+            note(f"  Killed processes matching: {pattern}")
+        
+        # Wait for exactly those processes to die instead of a fixed sleep
+        deadline = time.monotonic() + 2
+        while killed_pids and time.monotonic() < deadline:
+            killed_pids = [pid for pid in killed_pids if _pid_alive(pid)]
+            if killed_pids:
+                time.sleep(0.05)
+    else:
+        # No /proc (non-Linux): fall back to pkill
+        killed_any = False
+        for pattern in patterns:
+            try:
+                # pkill with -f matches full command line
+                cmd = ["pkill", "-9", "-f", pattern]
+                if user:
+                    cmd.extend(["-u", user])
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                if result.returncode == 0:
+                    note(f"  Killed processes matching: {pattern}")
+                    killed_any = True
+            except Exception as e:
+                # pkill returns non-zero if no processes found, which is fine
+                pass
+        
+        if killed_any:
+            time.sleep(2)  # Give processes time to die
     
     # Check GPU memory status
+    output = _query_gpu_memory()
+    if output is not None:
+        note("GPU Memory Status:")
+        for line in output.strip().split('\n'):
+            if line.strip():
+                note(f"  {line}")
+
+
+@functools.lru_cache(maxsize=1)
+def _nvidia_smi_path() -> Optional[str]:
+    """Locate nvidia-smi on PATH (once per process)."""
+    return shutil.which("nvidia-smi")
+
+
+def _query_gpu_memory() -> Optional[str]:
+    """Run the nvidia-smi per-GPU memory query.
+    
+    Returns:
+        CSV output (index, memory.used, memory.total per line), or None if
+        nvidia-smi is not installed or the query fails.
+    """
+    nvidia_smi = _nvidia_smi_path()
+    if nvidia_smi is None:
+        return None
     try:
         result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=index,memory.used,memory.total", "--format=csv,noheader"],
+            [nvidia_smi, "--query-gpu=index,memory.used,memory.total", "--format=csv,noheader"],
             capture_output=True,
             text=True,
             timeout=5
         )
-        if result.returncode == 0:
-            note("GPU Memory Status:")
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    note(f"  {line}")
     except Exception:
-        pass  # nvidia-smi might not be available
+        return None
+    return result.stdout if result.returncode == 0 else None
 
 
-def check_gpu_memory() -> List[Dict[str, str]]:
+class GpuMem(NamedTuple):
+    """Memory usage of one GPU as reported by nvidia-smi."""
+    
+    index: int
+    used_mib: int
+    total_mib: int
+
+
+# One "index, used MiB, total MiB" row of the nvidia-smi memory query
+_GPU_MEM_RE = re.compile(r'(\d+),\s*(\d+)\s*MiB,\s*(\d+)\s*MiB')
+
+
+def check_gpu_memory() -> List[GpuMem]:
     """Check current GPU memory usage.
     
     Returns:
-        List of dicts with 'index', 'used', 'total' keys for each GPU.
+        GpuMem (index, used_mib, total_mib) for each GPU; rows nvidia-smi
+        cannot report (e.g. "[N/A]") are skipped.
     """
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=index,memory.used,memory.total", "--format=csv,noheader"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            gpus = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = [p.strip() for p in line.split(',')]
-                    if len(parts) >= 3:
-                        gpus.append({
-                            'index': parts[0],
-                            'used': parts[1],
-                            'total': parts[2]
-                        })
-            return gpus
-    except Exception:
-        pass
-    return []
+    output = _query_gpu_memory()
+    if output is None:
+        return []
+    
+    return [
+        GpuMem(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        for m in _GPU_MEM_RE.finditer(output)
+    ]
 
 
 def parse_variants(spec: str) -> List[Tuple[str, str, str]]:
@@ -123,58 +254,99 @@ def parse_variants(spec: str) -> List[Tuple[str, str, str]]:
         if not entry:
             continue
         
-        parts = entry.split('::')
-        
-        if len(parts) == 1:
+        # Slice at the first (and, for env specs, second) '::' instead of
+        # splitting into a list and rejoining the args
+        sep = entry.find('::')
+        if sep == -1:
             # Just a label, no args or env
-            variants.append((parts[0], "", ""))
-        elif len(parts) == 2:
-            # Either "label::args" or "label::env:..."
-            label, rest = parts
-            if rest.startswith('env:'):
-                # env-only, no explicit args
-                env_csv = rest[4:]  # Remove "env:" prefix
-                variants.append((label, "", env_csv))
-            else:
-                # Just args
-                variants.append((label, rest, ""))
-        elif len(parts) >= 3:
-            # "label::env:K=V::args" or "label::something::args"
-            label = parts[0]
-            middle = parts[1]
-            rest = '::'.join(parts[2:])  # Rejoin in case args contain ::
-            
-            if middle.startswith('env:'):
-                env_csv = middle[4:]
-                variants.append((label, rest, env_csv))
-            else:
-                # Treat as label::args (ignore middle for now)
-                variants.append((label, middle + '::' + rest, ""))
+            variants.append((entry, "", ""))
+            continue
+        
+        label, rest = entry[:sep], entry[sep + 2:]
+        sep = rest.find('::')
+        middle = rest if sep == -1 else rest[:sep]
+        
+        if middle.startswith('env:'):
+            # "label::env:K=V" (env-only) or "label::env:K=V::args"
+            args = "" if sep == -1 else rest[sep + 2:]
+            variants.append((label, args, middle[4:]))
+        else:
+            # "label::args" (args may themselves contain '::')
+            variants.append((label, rest, ""))
         
     return variants
 
 
-def extract_tp_dp_from_args(args: str) -> Tuple[Optional[int], Optional[int]]:
-    """Extract tensor-parallel and data-parallel sizes from argument string.
+def parse_env_csv(env_csv: str) -> Dict[str, str]:
+    """Parse a comma-separated environment spec into a dict.
     
     Args:
-        args: Space-separated argument string.
+        env_csv: Environment variables as "K=V,K2=V2". Entries without
+            '=' are ignored; values may themselves contain '='.
+    
+    Returns:
+        Dict mapping variable names to values.
+    """
+    env = {}
+    for kv in env_csv.split(','):
+        key, sep, value = kv.partition('=')
+        if sep:
+            env[key.strip()] = value.strip()
+    return env
+
+
+# -tp N, --tensor-parallel-size N or --tensor-parallel-size=N (likewise for DP),
+# in one pattern so the string is scanned once; the "tp" group tells them apart
+_TP_DP_FLAG_RE = re.compile(
+    r'(?:^|\s)(?:(?P<tp>-tp|--tensor-parallel-size)|-dp|--data-parallel-size)(?:=|\s+)(?P<n>\d+)'
+)
+
+
+def _flag_int_value(argv: List[str], flags: Tuple[str, ...]) -> Optional[int]:
+    """Return the integer value of the first matching flag in an argv list.
+    
+    Accepts both "--flag N" and "--flag=N" forms.
+    """
+    for i, token in enumerate(argv):
+        flag, sep, value = token.partition('=')
+        if flag not in flags:
+            continue
+        if not sep:
+            value = argv[i + 1] if i + 1 < len(argv) else ""
+        if value.isdigit():
+            return int(value)
+    return None
+
+
+def extract_tp_dp_from_args(args: Union[str, List[str]]) -> Tuple[Optional[int], Optional[int]]:
+    """Extract tensor-parallel and data-parallel sizes from server arguments.
+    
+    Args:
+        args: Space-separated argument string or argv list. For a list,
+            flags are matched per token, so values are never mistaken
+            for flags.
     
     Returns:
         Tuple of (tp_size, dp_size), either can be None if not found.
     """
+    if not isinstance(args, str):
+        return (
+            _flag_int_value(args, ("-tp", "--tensor-parallel-size")),
+            _flag_int_value(args, ("-dp", "--data-parallel-size")),
+        )
+    
     tp_size = None
     dp_size = None
     
-    # Match -tp N or --tensor-parallel-size N
-    tp_match = re.search(r'(?:-tp|--tensor-parallel-size)\s+(\d+)', args)
-    if tp_match:
-        tp_size = int(tp_match.group(1))
-    
-    # Match -dp N or --data-parallel-size N (if such flag exists)
-    dp_match = re.search(r'(?:-dp|--data-parallel-size)\s+(\d+)', args)
-    if dp_match:
-        dp_size = int(dp_match.group(1))
+    # First occurrence of each flag wins
+    for match in _TP_DP_FLAG_RE.finditer(args):
+        if match.group('tp'):
+            if tp_size is None:
+                tp_size = int(match.group('n'))
+        elif dp_size is None:
+            dp_size = int(match.group('n'))
+        if tp_size is not None and dp_size is not None:
+            break
     
     return tp_size, dp_size
 
@@ -194,13 +366,10 @@ def compute_gpu_count(tp_size: Optional[int] = None, dp_size: Optional[int] = No
     return tp * dp
 
 
+@functools.lru_cache(maxsize=1)
 def is_chg_available() -> bool:
-    """Check if chg command is available."""
-    try:
-        result = subprocess.run(['which', 'chg'], capture_output=True, timeout=5)
-        return result.returncode == 0
-    except Exception:
-        return False
+    """Check if chg command is available (looked up on PATH once per process)."""
+    return shutil.which('chg') is not None
 
 
 def split_args_string(args: str) -> List[str]:
@@ -215,7 +384,11 @@ def split_args_string(args: str) -> List[str]:
     if not args:
         return []
     
-    # Simple split for now - can be enhanced with proper shell parsing if needed
+    # Without quotes or escapes shlex splits exactly on whitespace, so skip
+    # its pure-Python lexer for the common case
+    if "'" not in args and '"' not in args and '\\' not in args:
+        return args.split()
+    
     import shlex
     try:
         return shlex.split(args)
@@ -89,6 +89,13 @@ Examples:
     parser.add_argument("--variants", help="Variant spec for both MAIN and PR")
     parser.add_argument("--variants-main", help="Variant spec for MAIN only")
     parser.add_argument("--variants-pr", help="Variant spec for PR only")
+    parser.add_argument(
+        "--parallel-variants",
+        type=int,
+        default=1,
+        help="Run up to N variants at once on disjoint GPU slots (ports --port..--port+N-1). "
+             "Multiplies host RAM and disk pressure; results are less comparable under contention"
+    )
     
     # UI
     parser.add_argument(
@@ -165,7 +172,7 @@ class BenchmarkRunner(BaseBenchmarkRunner):
         try:
             # Run MAIN branch
             if self.args.which in ["both", "main"]:
-                force_rerun = self.args.re_run_main if hasattr(self.args, 're_run_main') else False
+                force_rerun = self.args.re_run_main
                 self.run_branch(
                     "MAIN",
                     self.args.main_ref,
@@ -179,7 +186,7 @@ class BenchmarkRunner(BaseBenchmarkRunner):
             # Run PR branch
             if self.args.which in ["both", "pr"]:
                 pr_ref = self.args.pr_ref or self.args.pr_branch
-                force_rerun = self.args.re_run_pr if hasattr(self.args, 're_run_pr') else False
+                force_rerun = self.args.re_run_pr
                 self.run_branch(
                     "PR",
                     pr_ref,
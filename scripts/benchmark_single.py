@@ -74,6 +74,13 @@ Examples:
     
     # Variants
     parser.add_argument("--variants", help="Variant spec (e.g., 'base::;full::-O.cudagraph_mode=FULL')")
+    parser.add_argument(
+        "--parallel-variants",
+        type=int,
+        default=1,
+        help="Run up to N variants at once on disjoint GPU slots (ports --port..--port+N-1). "
+             "Multiplies host RAM and disk pressure; results are less comparable under contention"
+    )
     
     # UI
     parser.add_argument(